@@ -1,16 +1,16 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from datetime import datetime
 
 print("Generating sample sales data...")
 print("="*60)
 
-# Set random seed for reproducibility
-np.random.seed(42)
+# Seeded PCG64 generator for reproducibility
+rng = np.random.default_rng(42)
 
 # Generate dates for entire year 2024
 start_date = datetime(2024, 1, 1)
-dates = [start_date + timedelta(days=x) for x in range(365)]
+dates = pd.date_range(start_date, periods=365, freq='D')
 
 # Define business data
 products = ['Laptop', 'Mouse', 'Keyboard', 'Monitor', 'Headphones']
@@ -26,52 +26,60 @@ product_prices = {
     'Headphones': (50, 300)
 }
 
-# Generate 1000 sales transactions
+# Generate 1000 sales transactions, one vectorized draw per column
 num_transactions = 1000
-data = []
-
-for i in range(num_transactions):
-    product = np.random.choice(products)
-    price_range = product_prices[product]
-    
-    transaction = {
-        'transaction_id': f'TXN{i+1:04d}',
-        'date': np.random.choice(dates),
-        'product': product,
-        'region': np.random.choice(regions),
-        'channel': np.random.choice(channels),
-        'quantity': np.random.randint(1, 10),
-        'unit_price': round(np.random.uniform(price_range[0], price_range[1]), 2),
-        'customer_id': f'CUST{np.random.randint(1000, 5000):04d}'
-    }
-    
-    # Calculate revenue
-    transaction['revenue'] = round(transaction['quantity'] * transaction['unit_price'], 2)
-    
-    data.append(transaction)
 
-# Create DataFrame
-df = pd.DataFrame(data)
+product_idx = rng.integers(0, len(products), size=num_transactions)
+product = np.array(products)[product_idx]
+
+# Per-product price bounds, aligned with the drawn products
+price_lows = np.array([product_prices[p][0] for p in products])[product_idx]
+price_highs = np.array([product_prices[p][1] for p in products])[product_idx]
+
+quantity = rng.integers(1, 10, size=num_transactions)
+customer_num = rng.integers(1000, 5000, size=num_transactions)
+unit_price = rng.uniform(price_lows, price_highs).round(2)
+
+# Zero-padded IDs built with NumPy string ops, no per-row f-strings
+transaction_ids = np.arange(1, num_transactions + 1)
+transaction_id = np.char.add('TXN', np.char.zfill(transaction_ids.astype(str), 4))
+customer_id = np.char.add('CUST', np.char.zfill(customer_num.astype(str), 4))
+
+data = {
+    'transaction_id': transaction_id,
+    'date': rng.choice(dates, size=num_transactions),
+    'product': product,
+    'region': rng.choice(regions, size=num_transactions),
+    'channel': rng.choice(channels, size=num_transactions),
+    'quantity': quantity,
+    'unit_price': unit_price,
+    'customer_id': customer_id,
+    # Calculate revenue
+    'revenue': (quantity * unit_price).round(2)
+}
 
-# Add useful columns
-df['date'] = pd.to_datetime(df['date'])
-df['year'] = df['date'].dt.year
-df['month'] = df['date'].dt.month
-df['quarter'] = df['date'].dt.quarter
-df['month_name'] = df['date'].dt.strftime('%B')
+# Create DataFrame straight from the column arrays, with explicit dtypes
+df = pd.DataFrame(data, copy=False)
+df = df.astype({
+    'quantity': 'int8',
+    'product': 'category',
+    'region': 'category',
+    'channel': 'category'
+})
 
 # Sort by date
 df = df.sort_values('date').reset_index(drop=True)
 
-# Save to CSV
+# Save to CSV, plus a typed columnar copy the metrics engine prefers
 df.to_csv('data/sample_sales_data.csv', index=False)
+df.to_parquet('data/sample_sales_data.parquet', index=False)
 
 print(f"\n✅ Generated {len(df)} transactions")
 print(f"✅ Date range: {df['date'].min().date()} to {df['date'].max().date()}")
 print(f"✅ Total revenue: ${df['revenue'].sum():,.2f}")
 print(f"✅ Products: {', '.join(products)}")
 print(f"✅ Regions: {', '.join(regions)}")
-print(f"\n📁 Data saved to: data/sample_sales_data.csv")
+print("\n📁 Data saved to: data/sample_sales_data.csv and data/sample_sales_data.parquet")
 
 # Show sample
 print("\nSample data (first 5 rows):")
@@ -6,17 +6,20 @@ Defines all specialized agents for the BI Query Assistant system.
 from crewai import Agent
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
+from functools import lru_cache
 import os
 
-# Load environment variables
+# Load environment variables once, at import
 load_dotenv()
+_OPENAI_KEY = os.getenv("OPENAI_API_KEY")
 
 
+@lru_cache(maxsize=1)
 def get_llm():
-    """Get configured OpenAI LLM."""
+    """Get configured OpenAI LLM, shared by all agents."""
     return ChatOpenAI(
         model="gpt-4o-mini",  # Cheaper, faster model
-        api_key=os.getenv("OPENAI_API_KEY"),
+        api_key=_OPENAI_KEY,
         temperature=0.1
     )
 
@@ -42,6 +45,7 @@ def create_controller_agent():
         You excel at breaking down complex business questions into manageable tasks
         and coordinating your team to deliver excellent results. You understand when
         to delegate, how to combine insights, and how to present findings clearly.""",
+        llm=get_llm(),
         verbose=True,
         allow_delegation=True
     )
@@ -75,6 +79,7 @@ def create_query_interpreter_agent():
         
         Time periods: Q1, Q2, Q3, Q4, or month names (January, February, etc.)
         Groupings: product, region, channel""",
+        llm=get_llm(),
         verbose=True,
         allow_delegation=False
     )
@@ -113,6 +118,7 @@ def create_data_analyst_agent():
         growth_rate.
         
         You're detail-oriented and always validate your results.""",
+        llm=get_llm(),
         verbose=True,
         allow_delegation=False
     )
@@ -143,6 +149,7 @@ def create_visualization_agent():
         - Rankings → Horizontal bar charts
         
         You always consider your audience and design for maximum clarity.""",
+        llm=get_llm(),
         verbose=True,
         allow_delegation=False
     )
@@ -174,6 +181,7 @@ def create_insight_reporter_agent():
         - Supporting data points
         - Business context
         - Actionable recommendations""",
+        llm=get_llm(),
         verbose=True,
         allow_delegation=False
     )
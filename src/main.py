@@ -4,18 +4,79 @@ Orchestrates multi-agent workflow for business intelligence queries.
 """
 
 from crewai import Crew, Task, Process
+import re
 import sys
 import os
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from agents.bi_agents import create_all_agents
+from agents.bi_agents import create_all_agents  # Also loads .env
 from tools.business_metrics_engine import BusinessMetricsEngine
-from dotenv import load_dotenv
 
-# Load environment
-load_dotenv()
+# Task descriptions, filled in per query with business_question and data_path
+
+# Task 1: Interpret the Query
+INTERPRET_TASK_TEMPLATE = """Analyze this business question: "{business_question}"
+            
+            Your job:
+            1. Identify what metric(s) need to be calculated
+            2. Determine any time period filters (Q1, Q2, specific months, etc.)
+            3. Identify any grouping dimensions (by product, region, channel, etc.)
+            4. Specify any limits (top 5, top 10, etc.)
+            
+            Available metrics: total_revenue, average_order_value, total_transactions,
+            customer_count, top_products, top_regions, revenue_by_channel, 
+            monthly_revenue, growth_rate
+            
+            Data location: {data_path}
+            
+            Provide a clear, structured analysis of what needs to be calculated."""
+
+# Task 2: Calculate Metrics
+ANALYZE_TASK_TEMPLATE = """Based on the query interpretation, calculate the required metrics.
+            
+            Original question: "{business_question}"
+            
+            Use the Business Metrics Engine to calculate metrics. For each metric needed:
+            1. Identify the metric name (e.g., 'total_revenue', 'top_products')
+            2. Apply appropriate time filters if specified
+            3. Apply groupings if needed
+            4. Set limits for rankings if applicable
+            
+            Example instructions:
+            - "Calculate total_revenue for Q1"
+            - "Calculate top_products with limit 5"
+            - "Calculate growth_rate"
+            
+            Provide the calculated results with clear labels."""
+
+# Task 3: Design Visualizations
+VISUALIZE_TASK_TEMPLATE = """Based on the analytical results, recommend appropriate visualizations.
+            
+            Original question: "{business_question}"
+            
+            For the data analyzed, specify:
+            1. Chart type (bar, line, pie, etc.) and why it's appropriate
+            2. What should be on X and Y axes
+            3. Title for the visualization
+            4. Any color or formatting suggestions
+            
+            Keep it practical and focused on clarity."""
+
+# Task 4: Generate Business Insights
+REPORT_TASK_TEMPLATE = """Create a comprehensive business insight report.
+            
+            Original question: "{business_question}"
+            
+            Your report should include:
+            1. **Executive Summary**: 2-3 sentence overview of key finding
+            2. **Key Metrics**: Highlight the most important numbers
+            3. **Analysis**: What do these numbers mean for the business?
+            4. **Trends**: Any patterns or notable changes
+            5. **Recommendations**: 2-3 actionable next steps
+            
+            Write in clear business language. Avoid jargon. Focus on actionable insights."""
 
 
 class BIQueryAssistant:
@@ -47,6 +108,45 @@ class BIQueryAssistant:
         # Create all agents
         self.agents = create_all_agents()
         
+        # Question patterns mapped to (metric, fixed calculate() kwargs).
+        # An intent matches when all of its keyword patterns are found, in any
+        # order. The optional limit pattern reads the N of 'top N <noun>',
+        # allowing up to three words in between ('top 10 selling products').
+        top = re.compile(r'\btop\b', re.I)
+        self._intent_patterns = [
+            ((re.compile(r'\btotals?\b', re.I), re.compile(r'\brevenue', re.I)), None,
+             ('total_revenue', {})),
+            ((top, re.compile(r'\bproducts?\b', re.I)),
+             re.compile(r'\btop\s+(\d+|ten)\b(?:\s+(?!top\b|products?\b|regions?\b)\w+){0,3}?\s+products?\b', re.I),
+             ('top_products', {})),
+            ((re.compile(r'\bgrowth\b', re.I),), None,
+             ('growth_rate', {})),
+            ((re.compile(r'\bcustomer', re.I),), None,
+             ('customer_count', {})),
+            ((top, re.compile(r'\bregions?\b', re.I)),
+             re.compile(r'\btop\s+(\d+|ten)\b(?:\s+(?!top\b|products?\b|regions?\b)\w+){0,3}?\s+regions?\b', re.I),
+             ('top_regions', {})),
+            ((re.compile(r'\bq1\b|\bquarter 1\b', re.I),), None,
+             ('total_revenue', {'time_period': 'Q1'})),
+        ]
+        
+        # Task graph shared by every query:
+        # (description template, agent, expected output, context task indices)
+        self._task_templates = [
+            (INTERPRET_TASK_TEMPLATE, 'interpreter',
+             "Structured list of analytical requirements including metrics, time periods, and groupings",
+             []),
+            (ANALYZE_TASK_TEMPLATE, 'analyst',
+             "Calculated metrics with clear numerical results",
+             [0]),
+            (VISUALIZE_TASK_TEMPLATE, 'visualizer',
+             "Visualization specifications with chart type and design details",
+             [1]),
+            (REPORT_TASK_TEMPLATE, 'reporter',
+             "Executive summary with key findings and actionable recommendations",
+             [1, 2]),
+        ]
+        
         print("✅ BI Query Assistant ready!")
     
     def process_query(self, business_question: str, data_path: str = "data/sample_sales_data.csv"):
@@ -65,94 +165,8 @@ class BIQueryAssistant:
         print(f"PROCESSING QUERY: {business_question}")
         print(f"{'='*80}\n")
         
-        # Task 1: Interpret the Query
-        interpret_task = Task(
-            description=f"""Analyze this business question: "{business_question}"
-            
-            Your job:
-            1. Identify what metric(s) need to be calculated
-            2. Determine any time period filters (Q1, Q2, specific months, etc.)
-            3. Identify any grouping dimensions (by product, region, channel, etc.)
-            4. Specify any limits (top 5, top 10, etc.)
-            
-            Available metrics: total_revenue, average_order_value, total_transactions,
-            customer_count, top_products, top_regions, revenue_by_channel, 
-            monthly_revenue, growth_rate
-            
-            Data location: {data_path}
-            
-            Provide a clear, structured analysis of what needs to be calculated.""",
-            agent=self.agents['interpreter'],
-            expected_output="Structured list of analytical requirements including metrics, time periods, and groupings"
-        )
-        
-        # Task 2: Calculate Metrics
-        analyze_task = Task(
-            description=f"""Based on the query interpretation, calculate the required metrics.
-            
-            Original question: "{business_question}"
-            
-            Use the Business Metrics Engine to calculate metrics. For each metric needed:
-            1. Identify the metric name (e.g., 'total_revenue', 'top_products')
-            2. Apply appropriate time filters if specified
-            3. Apply groupings if needed
-            4. Set limits for rankings if applicable
-            
-            Example instructions:
-            - "Calculate total_revenue for Q1"
-            - "Calculate top_products with limit 5"
-            - "Calculate growth_rate"
-            
-            Provide the calculated results with clear labels.""",
-            agent=self.agents['analyst'],
-            expected_output="Calculated metrics with clear numerical results",
-            context=[interpret_task]
-        )
-        
-        # Task 3: Design Visualizations
-        visualize_task = Task(
-            description=f"""Based on the analytical results, recommend appropriate visualizations.
-            
-            Original question: "{business_question}"
-            
-            For the data analyzed, specify:
-            1. Chart type (bar, line, pie, etc.) and why it's appropriate
-            2. What should be on X and Y axes
-            3. Title for the visualization
-            4. Any color or formatting suggestions
-            
-            Keep it practical and focused on clarity.""",
-            agent=self.agents['visualizer'],
-            expected_output="Visualization specifications with chart type and design details",
-            context=[analyze_task]
-        )
-        
-        # Task 4: Generate Business Insights
-        report_task = Task(
-            description=f"""Create a comprehensive business insight report.
-            
-            Original question: "{business_question}"
-            
-            Your report should include:
-            1. **Executive Summary**: 2-3 sentence overview of key finding
-            2. **Key Metrics**: Highlight the most important numbers
-            3. **Analysis**: What do these numbers mean for the business?
-            4. **Trends**: Any patterns or notable changes
-            5. **Recommendations**: 2-3 actionable next steps
-            
-            Write in clear business language. Avoid jargon. Focus on actionable insights.""",
-            agent=self.agents['reporter'],
-            expected_output="Executive summary with key findings and actionable recommendations",
-            context=[analyze_task, visualize_task]
-        )
-        
         # Create the Crew
-        crew = Crew(
-            agents=list(self.agents.values()),
-            tasks=[interpret_task, analyze_task, visualize_task, report_task],
-            process=Process.sequential,  # Tasks execute in order
-            verbose=True
-        )
+        crew = self._crew_factory(business_question, data_path)
         
         # Execute the workflow
         try:
@@ -184,35 +198,65 @@ class BIQueryAssistant:
             print(f"\n❌ {error_msg}")
             return error_msg
     
+    def _crew_factory(self, business_question: str, data_path: str) -> Crew:
+        """
+        Build the Crew for one question from the shared task templates.
+        
+        Task and Crew objects hold per-run state in CrewAI, so they are
+        created fresh each time; only the descriptions are filled in.
+        """
+        tasks = []
+        for template, agent_key, expected_output, context in self._task_templates:
+            task_kwargs = {}
+            if context:
+                task_kwargs['context'] = [tasks[i] for i in context]
+            
+            tasks.append(Task(
+                description=template.format(business_question=business_question, data_path=data_path),
+                agent=self.agents[agent_key],
+                expected_output=expected_output,
+                **task_kwargs
+            ))
+        
+        return Crew(
+            agents=list(self.agents.values()),
+            tasks=tasks,
+            process=Process.sequential,  # Tasks execute in order
+            verbose=True
+        )
+    
     def _execute_metrics(self, question: str) -> str:
         """
         Execute actual metric calculations based on question keywords.
         This demonstrates the custom tool in action.
         """
-        question_lower = question.lower()
-        results = []
-        
-        # Simple keyword matching to demonstrate tool
-        if 'revenue' in question_lower and 'total' in question_lower:
-            results.append(self.metrics_engine.calculate('total_revenue'))
-        
-        if 'top' in question_lower and 'product' in question_lower:
-            limit = 5
-            if 'top 10' in question_lower or 'top ten' in question_lower:
-                limit = 10
-            results.append(self.metrics_engine.calculate('top_products', limit=limit))
+        intents = []
         
-        if 'growth' in question_lower:
-            results.append(self.metrics_engine.calculate('growth_rate'))
-        
-        if 'customer' in question_lower:
-            results.append(self.metrics_engine.calculate('customer_count'))
+        # Simple pattern matching to demonstrate tool
+        for patterns, limit_pattern, (metric_name, kwargs) in self._intent_patterns:
+            if not all(pattern.search(question) for pattern in patterns):
+                continue
+            
+            if limit_pattern:
+                match = limit_pattern.search(question)
+                limit = 5
+                if match:
+                    limit = 10 if match.group(1).lower() == 'ten' else int(match.group(1))
+                # A limit below 1 would print an empty ranking
+                kwargs = {**kwargs, 'limit': limit if limit >= 1 else 5}
+            
+            intents.append((metric_name, tuple(sorted(kwargs.items()))))
         
-        if 'region' in question_lower and 'top' in question_lower:
-            results.append(self.metrics_engine.calculate('top_regions'))
+        # Metrics sharing the same arguments are calculated in one batch
+        batches = {}
+        for metric_name, kwargs in intents:
+            batches.setdefault(kwargs, []).append(metric_name)
         
-        if 'q1' in question_lower or 'quarter 1' in question_lower:
-            results.append(self.metrics_engine.calculate('total_revenue', time_period='Q1'))
+        calculated = {
+            kwargs: self.metrics_engine.calculate_batch(names, **dict(kwargs))
+            for kwargs, names in batches.items()
+        }
+        results = [calculated[kwargs][metric_name] for metric_name, kwargs in intents]
         
         return '\n\n'.join(results) if results else None
 
@@ -3,10 +3,323 @@ Business Metrics Engine - Custom Tool
 Encapsulates business domain knowledge for common KPI calculations.
 """
 
+import numpy as np
 import pandas as pd
 import os
+from types import MappingProxyType
 from typing import Optional
 
+try:
+    import polars as pl
+except ImportError:  # Optional: only needed for backend='polars'
+    pl = None
+
+try:
+    from numba import njit
+except ImportError:  # Optional: compiled monthly totals for very large datasets
+    njit = None
+
+
+# Display names for the integer month column (1 = January)
+MONTH_NAMES = ['January', 'February', 'March', 'April', 'May', 'June',
+               'July', 'August', 'September', 'October', 'November', 'December']
+
+# Row count from which monthly totals use the Numba kernel; below it the
+# pandas groupby is fast enough that JIT compilation would not pay off
+NUMBA_MIN_ROWS = 100_000
+
+
+def _monthly_sum_kernel(month_offsets, values, totals, counts):
+    """Accumulate values into per-month totals, indexed by month offset."""
+    for i in range(month_offsets.size):
+        totals[month_offsets[i]] += values[i]
+        counts[month_offsets[i]] += 1
+
+
+if njit is not None:
+    _monthly_sum_kernel = njit(cache=True)(_monthly_sum_kernel)
+
+
+# Business knowledge: metric definitions (read-only, shared by every engine)
+_METRIC_DEFS = MappingProxyType({
+    'total_revenue': MappingProxyType({
+        'formula': 'sum',
+        'column': 'revenue',
+        'description': 'Sum of all revenue'
+    }),
+    'average_order_value': MappingProxyType({
+        'formula': 'mean',
+        'column': 'revenue',
+        'description': 'Average revenue per transaction'
+    }),
+    'total_transactions': MappingProxyType({
+        'formula': 'count',
+        'column': 'transaction_id',
+        'description': 'Total number of transactions'
+    }),
+    'customer_count': MappingProxyType({
+        'formula': 'unique_count',
+        'column': 'customer_id',
+        'description': 'Number of unique customers'
+    }),
+    'top_products': MappingProxyType({
+        'formula': 'group_sum_ranked',
+        'column': 'revenue',
+        'group_by': 'product',
+        'description': 'Products ranked by revenue'
+    }),
+    'top_regions': MappingProxyType({
+        'formula': 'group_sum_ranked',
+        'column': 'revenue',
+        'group_by': 'region',
+        'description': 'Regions ranked by revenue'
+    }),
+    'revenue_by_channel': MappingProxyType({
+        'formula': 'group_sum',
+        'column': 'revenue',
+        'group_by': 'channel',
+        'description': 'Revenue by sales channel'
+    }),
+    'monthly_revenue': MappingProxyType({
+        'formula': 'time_series',
+        'column': 'revenue',
+        'group_by': 'month',
+        'description': 'Revenue by month'
+    }),
+    'growth_rate': MappingProxyType({
+        'formula': 'percentage_change',
+        'column': 'revenue',
+        'description': 'Month-over-month growth rate'
+    })
+})
+
+
+# Output formatting, shared by the pandas and Polars paths
+
+def _format_scalar(metric_name: str, formula: str, column: str, value) -> str:
+    """Format the result of a scalar metric."""
+    if formula == 'count':
+        return f"✅ {metric_name}: {int(value):,} transactions"
+    if formula == 'unique_count':
+        return f"✅ {metric_name}: {int(value):,} unique {column.replace('_', ' ')}"
+    return f"✅ {metric_name}: ${value:,.2f}"
+
+
+def _format_ranked(metric_name: str, result: pd.Series, limit: int) -> str:
+    """Format a ranking of group totals, largest first."""
+    lines = [f"{rank}. {name}: ${value:,.2f}\n" for rank, (name, value) in enumerate(result.items(), 1)]
+    return f"✅ {metric_name} (Top {limit}):\n\n" + "".join(lines)
+
+
+def _format_grouped(metric_name: str, result: pd.Series) -> str:
+    """Format group totals as a bullet list."""
+    lines = [f"- {name}: ${value:,.2f}\n" for name, value in result.items()]
+    return f"✅ {metric_name}:\n\n" + "".join(lines)
+
+
+def _format_monthly(metric_name: str, monthly: pd.Series) -> str:
+    """Format totals indexed by integer month in calendar order."""
+    monthly = monthly.reindex(range(1, 13)).dropna()
+    lines = [f"- {MONTH_NAMES[month - 1]}: ${value:,.2f}\n" for month, value in monthly.items()]
+    return f"✅ {metric_name}:\n\n" + "".join(lines)
+
+
+def _format_growth(metric_name: str, monthly: pd.Series) -> str:
+    """Format the latest month-over-month change of chronological totals."""
+    if len(monthly) < 2:
+        return "❌ Need at least 2 months for growth rate"
+    
+    latest = monthly.iloc[-1]
+    previous = monthly.iloc[-2]
+    growth = monthly.pct_change().iloc[-1] * 100
+    
+    lines = [
+        f"✅ {metric_name}:\n\n",
+        f"Latest month: ${latest:,.2f}\n",
+        f"Previous month: ${previous:,.2f}\n",
+        f"Growth rate: {growth:+.2f}%\n",
+        "\n📈 Positive growth" if growth > 0 else "\n📉 Negative growth"
+    ]
+    return "".join(lines)
+
+
+def _monthly_totals(df: pd.DataFrame, column: str) -> pd.Series:
+    """Sum a column per calendar month, in chronological order."""
+    if njit is None or len(df) < NUMBA_MIN_ROWS:
+        return df.groupby(df['date'].dt.to_period('M'), observed=True)[column].sum().sort_index()
+    
+    # Months since the epoch as plain integers, skipping Period objects entirely
+    months = df['date'].to_numpy().astype('datetime64[M]').view('i8')
+    first = months.min()
+    size = months.max() - first + 1
+    totals = np.zeros(size)
+    counts = np.zeros(size, dtype=np.int64)
+    _monthly_sum_kernel(months - first, df[column].to_numpy(dtype='float64'), totals, counts)
+    
+    index = pd.DatetimeIndex(
+        np.arange(first, first + size).astype('datetime64[M]').astype('datetime64[ns]')
+    ).to_period('M')
+    monthly = pd.Series(totals, index=index, name=column)
+    
+    # Match groupby: months without transactions are left out
+    return monthly[counts > 0]
+
+
+# Formula handlers: each takes the prepared data and returns the formatted result.
+# `aggs` holds totals precomputed at load time and is empty when a time filter is active.
+
+def _h_sum(df, aggs, metric_def, metric_name, group_by, limit):
+    column = metric_def['column']
+    return _format_scalar(metric_name, 'sum', column, df[column].sum())
+
+
+def _h_mean(df, aggs, metric_def, metric_name, group_by, limit):
+    column = metric_def['column']
+    return _format_scalar(metric_name, 'mean', column, df[column].mean())
+
+
+def _h_count(df, aggs, metric_def, metric_name, group_by, limit):
+    return _format_scalar(metric_name, 'count', metric_def['column'], len(df))
+
+
+def _h_unique_count(df, aggs, metric_def, metric_name, group_by, limit):
+    column = metric_def['column']
+    return _format_scalar(metric_name, 'unique_count', column, df[column].nunique())
+
+
+def _group_column(group_by, metric_def):
+    """Column to group on; 'month_name' is served by the integer month column."""
+    group_col = group_by or metric_def.get('group_by')
+    return 'month' if group_col == 'month_name' else group_col
+
+
+def _formula_columns(metric_def, group_by):
+    """Columns a formula's handler reads; group_by only matters to grouped formulas."""
+    formula = metric_def['formula']
+    columns = [metric_def['column']]
+    if formula in ('group_sum', 'group_sum_ranked'):
+        columns.append(_group_column(group_by, metric_def))
+    elif formula == 'time_series':
+        columns.append('month')
+    elif formula == 'percentage_change':
+        columns.append('date')
+    return list(dict.fromkeys(c for c in columns if c))
+
+
+def _label_groups(result, group_by):
+    """Show month names when results were grouped through the 'month_name' alias."""
+    if group_by == 'month_name':
+        return result.rename(index=lambda month: MONTH_NAMES[month - 1])
+    return result
+
+
+def _group_totals(df, aggs, column, group_col):
+    """Group totals sorted largest first, from the precomputed aggregates when possible."""
+    result = aggs.get(f"{group_col}_{column}")
+    if result is None:
+        result = df.groupby(group_col, observed=True)[column].sum().sort_values(ascending=False)
+    return result
+
+
+def _h_ranked(df, aggs, metric_def, metric_name, group_by, limit):
+    group_col = _group_column(group_by, metric_def)
+    if not group_col:
+        return "❌ This metric requires a group_by parameter"
+    
+    result = _group_totals(df, aggs, metric_def['column'], group_col)
+    return _format_ranked(metric_name, _label_groups(result.head(limit), group_by), limit)
+
+
+def _h_grouped(df, aggs, metric_def, metric_name, group_by, limit):
+    group_col = _group_column(group_by, metric_def)
+    result = _group_totals(df, aggs, metric_def['column'], group_col)
+    return _format_grouped(metric_name, _label_groups(result, group_by))
+
+
+def _h_time_series(df, aggs, metric_def, metric_name, group_by, limit):
+    column = metric_def['column']
+    monthly = aggs.get(f"month_{column}")
+    if monthly is None:
+        monthly = df.groupby('month', observed=True)[column].sum()
+    return _format_monthly(metric_name, monthly)
+
+
+def _h_growth(df, aggs, metric_def, metric_name, group_by, limit):
+    column = metric_def['column']
+    monthly = aggs.get(f"monthly_{column}")
+    if monthly is None:
+        monthly = _monthly_totals(df, column)
+    return _format_growth(metric_name, monthly)
+
+
+_HANDLERS = {
+    'sum': _h_sum,
+    'mean': _h_mean,
+    'count': _h_count,
+    'unique_count': _h_unique_count,
+    'group_sum_ranked': _h_ranked,
+    'group_sum': _h_grouped,
+    'time_series': _h_time_series,
+    'percentage_change': _h_growth
+}
+
+
+# Polars counterparts of the handlers. Scalar formulas map to a reduction
+# expression evaluated in one select; the others map to a query builder,
+# (lazy frame, definition, group_by, limit) -> (query, group column), and
+# a formatter for the collected (group -> total) Series.
+
+_POLARS_REDUCTIONS = {
+    'sum': lambda column: pl.col(column).sum(),
+    'mean': lambda column: pl.col(column).mean(),
+    'count': lambda column: pl.len(),
+    'unique_count': lambda column: pl.col(column).n_unique()
+}
+
+
+def _pl_group_totals(lf, metric_def, group_by, limit):
+    group_col = _group_column(group_by, metric_def)
+    if not group_col:
+        return None, None
+    column = metric_def['column']
+    return lf.group_by(group_col).agg(pl.col(column).sum()).sort(column, descending=True), group_col
+
+
+def _pl_time_series(lf, metric_def, group_by, limit):
+    return lf.group_by('month').agg(pl.col(metric_def['column']).sum()), 'month'
+
+
+def _pl_growth(lf, metric_def, group_by, limit):
+    query = (
+        lf.group_by(pl.col('date').dt.truncate('1mo').alias('period'))
+        .agg(pl.col(metric_def['column']).sum())
+        .sort('period')
+    )
+    return query, 'period'
+
+
+_POLARS_HANDLERS = {
+    'group_sum_ranked': (
+        # Limit after the empty-data check, with the same head() semantics as pandas
+        _pl_group_totals,
+        lambda metric_name, result, group_by, limit:
+            _format_ranked(metric_name, _label_groups(result.head(limit), group_by), limit)
+    ),
+    'group_sum': (
+        _pl_group_totals,
+        lambda metric_name, result, group_by, limit:
+            _format_grouped(metric_name, _label_groups(result, group_by))
+    ),
+    'time_series': (
+        _pl_time_series,
+        lambda metric_name, result, group_by, limit: _format_monthly(metric_name, result)
+    ),
+    'percentage_change': (
+        _pl_growth,
+        lambda metric_name, result, group_by, limit: _format_growth(metric_name, result)
+    )
+}
+
 
 class BusinessMetricsEngine:
     """
@@ -15,7 +328,29 @@ class BusinessMetricsEngine:
     to figure out formulas each time.
     """
     
-    def __init__(self):
+    # Scalar formulas and the pandas reduction that computes each one.
+    # 'count' is the row count (None), matching calculate() and the Polars path.
+    SCALAR_AGGREGATIONS = {
+        'sum': 'sum',
+        'mean': 'mean',
+        'count': None,
+        'unique_count': 'nunique'
+    }
+    
+    METRIC_DEFINITIONS = _METRIC_DEFS
+    
+    def __init__(self, backend: str = 'pandas'):
+        """
+        Args:
+            backend: 'pandas' (default) or 'polars'. The Polars backend runs
+                     each metric as one multi-threaded lazy query, which pays
+                     off on large datasets. It falls back to pandas when Polars
+                     is not installed.
+        """
+        if backend not in ('pandas', 'polars'):
+            raise ValueError(f"Unknown backend: {backend}")
+        self.backend = backend if pl is not None else 'pandas'
+        
         self.name = "Business Metrics Calculator"
         self.description = (
             "Calculates common business metrics like revenue, growth rate, "
@@ -23,58 +358,11 @@ class BusinessMetricsEngine:
             "standard business KPIs."
         )
         
-        # Business knowledge: metric definitions
-        self.METRIC_DEFINITIONS = {
-            'total_revenue': {
-                'formula': 'sum',
-                'column': 'revenue',
-                'description': 'Sum of all revenue'
-            },
-            'average_order_value': {
-                'formula': 'mean',
-                'column': 'revenue',
-                'description': 'Average revenue per transaction'
-            },
-            'total_transactions': {
-                'formula': 'count',
-                'column': 'transaction_id',
-                'description': 'Total number of transactions'
-            },
-            'customer_count': {
-                'formula': 'unique_count',
-                'column': 'customer_id',
-                'description': 'Number of unique customers'
-            },
-            'top_products': {
-                'formula': 'group_sum_ranked',
-                'column': 'revenue',
-                'group_by': 'product',
-                'description': 'Products ranked by revenue'
-            },
-            'top_regions': {
-                'formula': 'group_sum_ranked',
-                'column': 'revenue',
-                'group_by': 'region',
-                'description': 'Regions ranked by revenue'
-            },
-            'revenue_by_channel': {
-                'formula': 'group_sum',
-                'column': 'revenue',
-                'group_by': 'channel',
-                'description': 'Revenue by sales channel'
-            },
-            'monthly_revenue': {
-                'formula': 'time_series',
-                'column': 'revenue',
-                'group_by': 'month_name',
-                'description': 'Revenue by month'
-            },
-            'growth_rate': {
-                'formula': 'percentage_change',
-                'column': 'revenue',
-                'description': 'Month-over-month growth rate'
-            }
-        }
+        # Parsed data files, keyed by (path, modification time)
+        self._df_cache: dict[tuple[str, float], pd.DataFrame] = {}
+        
+        # Per-file group totals over the unfiltered data, built at load time
+        self._aggs: dict[str, dict[str, pd.Series]] = {}
     
     def calculate(
         self, 
@@ -104,125 +392,275 @@ class BusinessMetricsEngine:
                 available = ', '.join(self.METRIC_DEFINITIONS.keys())
                 return f"❌ Metric '{metric_name}' not found.\n\nAvailable: {available}"
             
-            # Load data
-            if not os.path.exists(dataframe_path):
-                return f"❌ Data file not found: {dataframe_path}"
-            
-            df = pd.read_csv(dataframe_path)
-            df['date'] = pd.to_datetime(df['date'])
-            
-            # Apply time filter
-            if time_period != "all":
-                df = self._filter_by_time(df, time_period)
-                if len(df) == 0:
-                    return f"❌ No data for time period: {time_period}"
+            if self.backend == 'polars':
+                return self._calc_polars(metric_name, dataframe_path, time_period, group_by, limit)
             
             # Get metric configuration
             metric_def = self.METRIC_DEFINITIONS[metric_name]
             formula = metric_def['formula']
-            column = metric_def['column']
             
-            # Calculate based on formula
-            if formula == 'sum':
-                result = df[column].sum()
-                return f"✅ {metric_name}: ${result:,.2f}"
+            handler = _HANDLERS.get(formula)
+            if handler is None:
+                return f"❌ Unknown formula: {formula}"
             
-            elif formula == 'mean':
-                result = df[column].mean()
-                return f"✅ {metric_name}: ${result:,.2f}"
+            # Load and filter only the columns this metric reads
+            columns = _formula_columns(metric_def, group_by)
+            df, aggs, error = self._prepare_data(dataframe_path, time_period, columns)
+            if error:
+                return error
             
-            elif formula == 'count':
-                result = len(df)
-                return f"✅ {metric_name}: {result:,} transactions"
+            return handler(df, aggs, metric_def, metric_name, group_by, limit)
+        
+        except Exception as e:
+            return f"❌ Error calculating metric: {str(e)}"
+    
+    def calculate_batch(self, metric_names: list, **filters) -> dict:
+        """
+        Calculate several metrics at once.
+        
+        Scalar metrics (sum, mean, count, unique count) that read the same
+        column are reduced together in a single pass over that column.
+        Other metrics are delegated to calculate().
+        
+        Args:
+            metric_names: Names of the metrics to calculate
+            **filters: Any keyword arguments accepted by calculate()
             
-            elif formula == 'unique_count':
-                result = df[column].nunique()
-                return f"✅ {metric_name}: {result:,} unique {column.replace('_', ' ')}"
+        Returns:
+            Dictionary mapping each metric name to its formatted result
+        """
+        results = {}
+        
+        # Group scalar metrics by the column they reduce
+        scalar_metrics = {}
+        for metric_name in metric_names:
+            metric_def = self.METRIC_DEFINITIONS.get(metric_name)
+            if metric_def and metric_def['formula'] in self.SCALAR_AGGREGATIONS:
+                scalar_metrics.setdefault(metric_def['column'], []).append(metric_name)
+            else:
+                results[metric_name] = self.calculate(metric_name, **filters)
+        
+        if scalar_metrics:
+            dataframe_path = filters.get('dataframe_path', "data/sample_sales_data.csv")
+            time_period = filters.get('time_period', "all")
+            try:
+                if self.backend == 'polars':
+                    names = [name for names in scalar_metrics.values() for name in names]
+                    results.update(self._calc_polars_scalars(names, dataframe_path, time_period))
+                else:
+                    df, _, error = self._prepare_data(dataframe_path, time_period, list(scalar_metrics))
+                    for column, names in scalar_metrics.items():
+                        if error:
+                            results.update((name, error) for name in names)
+                            continue
+                        
+                        formulas = [self.METRIC_DEFINITIONS[name]['formula'] for name in names]
+                        funcs = [self.SCALAR_AGGREGATIONS[f] for f in formulas]
+                        funcs = list(dict.fromkeys(func for func in funcs if func))
+                        values = df[column].agg(funcs) if funcs else {}
+                        for name, formula in zip(names, formulas):
+                            func = self.SCALAR_AGGREGATIONS[formula]
+                            value = values[func] if func else len(df)
+                            results[name] = _format_scalar(name, formula, column, value)
             
-            elif formula == 'group_sum_ranked':
-                group_col = group_by or metric_def.get('group_by')
-                if not group_col:
-                    return "❌ This metric requires a group_by parameter"
-                
-                result = df.groupby(group_col)[column].sum().sort_values(ascending=False).head(limit)
-                
-                output = f"✅ {metric_name} (Top {limit}):\n\n"
-                for rank, (name, value) in enumerate(result.items(), 1):
-                    output += f"{rank}. {name}: ${value:,.2f}\n"
-                return output
+            except Exception as e:
+                for names in scalar_metrics.values():
+                    results.update((name, f"❌ Error calculating metric: {str(e)}") for name in names)
+        
+        return {name: results[name] for name in metric_names}
+    
+    def _prepare_data(self, dataframe_path: str, time_period: str, columns: Optional[list] = None):
+        """
+        Load and time-filter the data for a calculation.
+        
+        When a filter applies, the row mask and the column projection are
+        taken in a single .loc so only one narrowed copy is made.
+        
+        Returns:
+            Tuple of (dataframe, precomputed aggregates, error message).
+            The error message is None when the data is ready to use.
+        """
+        source = self._source_path(dataframe_path)
+        if not os.path.exists(source):
+            return None, {}, f"❌ Data file not found: {dataframe_path}"
+        
+        # Shallow copy so time filters never touch the cached frame
+        df = self._load_df(source).copy(deep=False)
+        
+        missing = [c for c in (columns or []) if c not in df.columns]
+        if missing:
+            return None, {}, f"❌ Column not found: {', '.join(missing)}"
+        
+        # Precomputed totals only describe the unfiltered data
+        aggs = self._aggs[source] if time_period == "all" else {}
+        
+        # Apply time filter
+        mask = self._time_mask(df, time_period) if time_period != "all" else None
+        if mask is not None:
+            df = df.loc[mask, columns] if columns else df.loc[mask]
+            if len(df) == 0:
+                return None, {}, f"❌ No data for time period: {time_period}"
+        
+        return df, aggs, None
+    
+    def _calc_polars(
+        self,
+        metric_name: str,
+        dataframe_path: str,
+        time_period: str,
+        group_by: Optional[str],
+        limit: int
+    ) -> str:
+        """
+        Polars version of calculate().
+        
+        The time filter, grouping and sorting are fused into one lazy
+        query, so Polars only reads the columns it needs and runs the
+        aggregation on all cores.
+        """
+        if not os.path.exists(self._source_path(dataframe_path)):
+            return f"❌ Data file not found: {dataframe_path}"
+        
+        metric_def = self.METRIC_DEFINITIONS[metric_name]
+        formula = metric_def['formula']
+        column = metric_def['column']
+        
+        if formula in self.SCALAR_AGGREGATIONS:
+            return self._calc_polars_scalars([metric_name], dataframe_path, time_period)[metric_name]
+        
+        if formula not in _POLARS_HANDLERS:
+            return f"❌ Unknown formula: {formula}"
+        build_query, format_result = _POLARS_HANDLERS[formula]
+        
+        lf = self._scan_polars(dataframe_path, time_period)
+        query, group_col = build_query(lf, metric_def, group_by, limit)
+        if query is None:
+            return "❌ This metric requires a group_by parameter"
+        
+        frame = query.collect()
+        if frame.height == 0:
+            return f"❌ No data for time period: {time_period}"
+        result = pd.Series(frame[column].to_list(), index=frame[group_col].to_list())
+        
+        return format_result(metric_name, result, group_by, limit)
+    
+    def _calc_polars_scalars(self, metric_names: list, dataframe_path: str, time_period: str) -> dict:
+        """Evaluate scalar metrics with Polars in a single lazy select."""
+        if not os.path.exists(self._source_path(dataframe_path)):
+            return {name: f"❌ Data file not found: {dataframe_path}" for name in metric_names}
+        
+        exprs = [pl.len().alias('__rows__')]
+        for name in metric_names:
+            metric_def = self.METRIC_DEFINITIONS[name]
+            exprs.append(_POLARS_REDUCTIONS[metric_def['formula']](metric_def['column']).alias(name))
+        frame = self._scan_polars(dataframe_path, time_period).select(exprs).collect()
+        
+        if frame['__rows__'][0] == 0:
+            return {name: f"❌ No data for time period: {time_period}" for name in metric_names}
+        
+        results = {}
+        for name in metric_names:
+            metric_def = self.METRIC_DEFINITIONS[name]
+            results[name] = _format_scalar(name, metric_def['formula'], metric_def['column'], frame[name][0])
+        return results
+    
+    def _scan_polars(self, dataframe_path: str, time_period: str):
+        """Lazily scan a data file with Polars, deriving time columns and applying the time filter."""
+        source = self._source_path(dataframe_path)
+        if source.endswith('.parquet'):
+            lf = pl.scan_parquet(source)
+        else:
+            lf = pl.scan_csv(source, try_parse_dates=True)
+        
+        date = pl.col('date')
+        lf = lf.with_columns(
+            date.dt.year().alias('year'),
+            date.dt.month().alias('month'),
+            date.dt.quarter().alias('quarter')
+        )
+        
+        if time_period in ['Q1', 'Q2', 'Q3', 'Q4']:
+            return lf.filter(pl.col('quarter') == int(time_period[1]))
+        if time_period in MONTH_NAMES:
+            return lf.filter(pl.col('month') == MONTH_NAMES.index(time_period) + 1)
+        if time_period.isdigit():
+            return lf.filter(pl.col('year') == int(time_period))
+        return lf
+    
+    def _source_path(self, path: str) -> str:
+        """Prefer a Parquet sibling of a CSV path when one exists."""
+        parquet_path = os.path.splitext(path)[0] + '.parquet'
+        if os.path.exists(parquet_path):
+            return parquet_path
+        return path
+    
+    def _load_df(self, path: str) -> pd.DataFrame:
+        """Load and parse a data file, reusing the cached copy until it changes on disk."""
+        source = self._source_path(path)
+        key = (source, os.path.getmtime(source))
+        if key not in self._df_cache:
+            # Drop any stale entry for this path before caching the new one
+            for cached_key in [k for k in self._df_cache if k[0] == source]:
+                del self._df_cache[cached_key]
             
-            elif formula == 'group_sum':
-                group_col = group_by or metric_def.get('group_by')
-                result = df.groupby(group_col)[column].sum().sort_values(ascending=False)
-                
-                output = f"✅ {metric_name}:\n\n"
-                for name, value in result.items():
-                    output += f"- {name}: ${value:,.2f}\n"
-                return output
+            # Keep every column so any of them can be used as a group_by dimension
+            if source.endswith('.parquet'):
+                df = pd.read_parquet(source)
+            else:
+                df = pd.read_csv(
+                    source,
+                    parse_dates=['date'],
+                    dtype={'product': 'category', 'region': 'category', 'channel': 'category'}
+                )
             
-            elif formula == 'time_series':
-                monthly = df.groupby('month_name')[column].sum()
-                month_order = ['January', 'February', 'March', 'April', 'May', 'June',
-                             'July', 'August', 'September', 'October', 'November', 'December']
-                monthly = monthly.reindex([m for m in month_order if m in monthly.index])
-                
-                output = f"✅ {metric_name}:\n\n"
-                for month, value in monthly.items():
-                    output += f"- {month}: ${value:,.2f}\n"
-                return output
+            # Calendar columns for time filters and monthly metrics, via vectorized .dt accessors.
+            # The smallest integer types that fit keep the cached frame narrow.
+            df['year'] = df['date'].dt.year.astype('int16')
+            df['month'] = df['date'].dt.month.astype('int8')
+            df['quarter'] = df['date'].dt.quarter.astype('int8')
             
-            elif formula == 'percentage_change':
-                monthly = df.groupby(df['date'].dt.to_period('M'))[column].sum()
-                monthly = monthly.sort_index()
-                
-                if len(monthly) < 2:
-                    return "❌ Need at least 2 months for growth rate"
-                
-                latest = monthly.iloc[-1]
-                previous = monthly.iloc[-2]
-                growth = ((latest - previous) / previous) * 100
-                
-                output = f"✅ {metric_name}:\n\n"
-                output += f"Latest month: ${latest:,.2f}\n"
-                output += f"Previous month: ${previous:,.2f}\n"
-                output += f"Growth rate: {growth:+.2f}%\n"
-                
-                if growth > 0:
-                    output += f"\n📈 Positive growth"
-                else:
-                    output += f"\n📉 Negative growth"
-                
-                return output
+            # Low-cardinality labels as categories: filters and groupbys compare integer codes.
+            # A no-op for CSVs and generated Parquet, which already load them as categories.
+            for column in ['product', 'region', 'channel']:
+                df[column] = df[column].astype('category')
             
-            else:
-                return f"❌ Unknown formula: {formula}"
-        
-        except Exception as e:
-            return f"❌ Error calculating metric: {str(e)}"
+            self._df_cache[key] = df
+            self._aggs[source] = self._build_aggregates(df)
+        return self._df_cache[key]
+    
+    def _build_aggregates(self, df: pd.DataFrame) -> dict:
+        """Precompute the group totals used by the ranking and trend metrics."""
+        aggs = {}
+        for definition in self.METRIC_DEFINITIONS.values():
+            group_col = definition.get('group_by')
+            column = definition['column']
+            if group_col:
+                aggs[f"{group_col}_{column}"] = (
+                    df.groupby(group_col, observed=True)[column].sum().sort_values(ascending=False)
+                )
+            if definition['formula'] == 'percentage_change':
+                aggs[f"monthly_{column}"] = _monthly_totals(df, column)
+        return aggs
     
-    def _filter_by_time(self, df, time_period):
-        """Filter data by time period."""
+    def _time_mask(self, df, time_period) -> Optional[pd.Series]:
+        """Boolean row mask for a time period, or None if the period is not recognised."""
         
         # Quarter filters
         if time_period in ['Q1', 'Q2', 'Q3', 'Q4']:
             quarter_num = int(time_period[1])
-            return df[df['quarter'] == quarter_num]
+            return df['quarter'] == quarter_num
         
         # Month filters
-        months = ['January', 'February', 'March', 'April', 'May', 'June',
-                 'July', 'August', 'September', 'October', 'November', 'December']
-        if time_period in months:
-            return df[df['month_name'] == time_period]
+        if time_period in MONTH_NAMES:
+            return df['month'] == MONTH_NAMES.index(time_period) + 1
         
         # Year filter
         if time_period.isdigit():
-            return df[df['year'] == int(time_period)]
+            return df['year'] == int(time_period)
         
-        return df
+        return None
     
     def list_metrics(self) -> str:
         """Return list of available metrics."""
-        output = "Available Metrics:\n\n"
-        for name, definition in self.METRIC_DEFINITIONS.items():
-            output += f"- {name}: {definition['description']}\n"
-        return output
\ No newline at end of file
+        lines = [f"- {name}: {definition['description']}\n" for name, definition in self.METRIC_DEFINITIONS.items()]
+        return "Available Metrics:\n\n" + "".join(lines)
\ No newline at end of file
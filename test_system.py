@@ -1,11 +1,14 @@
 """
 Test the complete BI Query Assistant system with various queries.
+
+Queries run concurrently by default since each one mostly waits on LLM calls.
+Pass --interactive to run them one at a time, pausing between tests.
 """
 
-from src.main import BIQueryAssistant
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Create assistant
-assistant = BIQueryAssistant()
+from src.main import BIQueryAssistant
 
 # Test queries covering different scenarios
 test_queries = [
@@ -15,24 +18,53 @@ test_queries = [
     "How many unique customers do we have?",
     "What was our Q1 revenue?"
 ]
+selected_queries = test_queries[:3]
+interactive = '--interactive' in sys.argv
 
 
 print("TESTING BI QUERY ASSISTANT - MULTIPLE QUERIES")
 print("="*80)
 
-for i, query in enumerate(test_queries[:3], 1):  
-    print(f"\n{'#'*80}")
-    print(f"TEST {i}/3: {query}")
-    print(f"{'#'*80}\n")
-    
-    try:
-        result = assistant.process_query(query)
-        print(f"\n✅ Test {i} completed successfully!")
-    except Exception as e:
-        print(f"\n❌ Test {i} failed: {e}")
+if interactive:
+    # Create assistant
+    assistant = BIQueryAssistant()
     
+    for i, query in enumerate(selected_queries, 1):  
+        print(f"\n{'#'*80}")
+        print(f"TEST {i}/{len(selected_queries)}: {query}")
+        print(f"{'#'*80}\n")
+        
+        try:
+            result = assistant.process_query(query)
+            print(f"\n✅ Test {i} completed successfully!")
+        except Exception as e:
+            print(f"\n❌ Test {i} failed: {e}")
+        
+        
+        input("Press Enter to continue to next test...")
+else:
+    def run_query(query):
+        # CrewAI writes run state onto the agents during kickoff, so each
+        # concurrent query gets its own assistant (agents and metrics engine)
+        return BIQueryAssistant().process_query(query)
     
-    input("Press Enter to continue to next test...")
+    # Independent queries: overlap their LLM round-trips
+    with ThreadPoolExecutor(max_workers=min(5, len(selected_queries))) as executor:
+        futures = {}
+        for i, query in enumerate(selected_queries, 1):
+            print(f"\n{'#'*80}")
+            print(f"TEST {i}/{len(selected_queries)} STARTED: {query}")
+            print(f"{'#'*80}\n")
+            futures[executor.submit(run_query, query)] = (i, query)
+        
+        # Agent logs from running tests interleave; results are tagged with their query
+        for future in as_completed(futures):
+            i, query = futures[future]
+            try:
+                result = future.result()
+                print(f"\n✅ Test {i} ({query}) completed successfully!")
+            except Exception as e:
+                print(f"\n❌ Test {i} ({query}) failed: {e}")
 
 
 print("🎉 SYSTEM TESTING COMPLETE!")
@@ -29,5 +29,20 @@ print(tool.calculate("total_revenue", time_period="Q1"))
 print("\n6. List all metrics:")
 print(tool.list_metrics())
 
+# Test 7
+print("\n7. Batch of metrics:")
+batch = tool.calculate_batch(["total_revenue", "average_order_value", "total_transactions", "top_products"])
+for result in batch.values():
+    print(result)
+
+# Test 8
+print("\n8. Polars backend (falls back to pandas if Polars is not installed):")
+polars_tool = BusinessMetricsEngine(backend="polars")
+print(polars_tool.calculate("top_products", time_period="Q1", limit=3))
+
+# Test 9
+print("\n9. Q1 Monthly Revenue (group_by does not apply to time series):")
+print(tool.calculate("monthly_revenue", time_period="Q1", group_by="product"))
+
 print("\n" + "="*60)
 print("✅ Custom tool working perfectly!")
\ No newline at end of file